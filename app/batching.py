@@ -0,0 +1,106 @@
+"""
+Micro-batching Module
+Coalesce concurrent prediction requests into a single forward pass
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+import torch
+
+from .model_loader import MAX_BATCH_SIZE, ModelLoader
+
+logger = logging.getLogger(__name__)
+
+MAX_WAIT_MS = float(os.getenv("MAX_WAIT_MS", "5"))
+
+
+class MicroBatcher:
+    """Queue single-image requests and run them through the model in batches"""
+
+    def __init__(
+        self,
+        model_loader: ModelLoader,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.model_loader = model_loader
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background batching task on the running event loop"""
+        if self.is_running():
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._batcher())
+        logger.info(
+            f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.1f})"
+        )
+
+    async def stop(self):
+        """Stop the background batching task"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    def is_running(self) -> bool:
+        """Check if the batching task is running"""
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, image_tensor: torch.Tensor) -> Dict:
+        """
+        Queue a preprocessed image and wait for its prediction
+
+        Args:
+            image_tensor: Tensor returned by ModelLoader.preprocess()
+
+        Returns:
+            Dictionary with prediction results
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_tensor, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[torch.Tensor, asyncio.Future]]:
+        """Wait for one request, then give others max_wait to join the batch"""
+        items = [await self._queue.get()]
+
+        # asyncio.wait_for is avoided here since it can swallow cancellation
+        if self._queue.qsize() < self.max_batch_size - 1:
+            await asyncio.sleep(self.max_wait)
+        while len(items) < self.max_batch_size and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+
+        return items
+
+    async def _batcher(self):
+        """Background loop running one forward pass per collected batch"""
+        while True:
+            items = await self._collect()
+            tensors = [tensor for tensor, _ in items]
+
+            try:
+                # Run inference off the event loop so new requests keep queueing
+                results = await asyncio.to_thread(
+                    self.model_loader.predict_batch, tensors
+                )
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
@@ -2,20 +2,25 @@
 Brain Tumor Classification API
 FastAPI application for serving the trained CNN model
 """
-import io
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
 
-from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+import torch
+from fastapi import Depends, FastAPI, File, HTTPException, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from PIL import Image
 from pydantic import BaseModel
 
+from .batching import MicroBatcher
 from .model_loader import ModelLoader
-from .monitoring import MetricsCollector, log_prediction
+from .monitoring import MetricsCollector, log_prediction, prediction_log_writer
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +33,7 @@ app = FastAPI(
     title="Brain Tumor Classification API",
     description="Deep Learning API for classifying brain MRI scans",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -44,6 +50,42 @@ async def serve_frontend(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+# Maximum upload size per request (summed across files for batches)
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", "10")) * 1024 * 1024)
+UPLOAD_ENDPOINTS = {"/predict", "/batch_predict"}
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversize uploads from Content-Length before the body is read"""
+
+    def __init__(self, app, max_bytes: int, paths: set):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        # Plain ASGI, so other routes pass straight through at no extra cost
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"] in self.paths
+        ):
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > self.max_bytes:
+                response = JSONResponse(
+                    status_code=413,
+                    content={"detail": "Upload exceeds maximum allowed size"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so that CORS headers are also set on 413 responses
+app.add_middleware(
+    UploadSizeLimitMiddleware, max_bytes=MAX_UPLOAD_BYTES, paths=UPLOAD_ENDPOINTS
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +98,10 @@ app.add_middleware(
 # Initialize model loader and metrics
 model_loader = ModelLoader()
 metrics_collector = MetricsCollector()
+micro_batcher = MicroBatcher(model_loader)
+
+# Thread pool for image decoding (PIL and libjpeg-turbo release the GIL)
+decode_pool = ThreadPoolExecutor()
 
 # Class labels
 CLASS_NAMES = ["glioma", "meningioma", "no_tumor", "pituitary"]
@@ -92,6 +138,16 @@ async def startup_event():
         logger.error(f"Failed to load model: {str(e)}")
         raise
 
+    micro_batcher.start()
+    prediction_log_writer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks on shutdown"""
+    await micro_batcher.stop()
+    await prediction_log_writer.stop()
+
 
 @app.get("/", response_model=Dict[str, str])
 async def root():
@@ -114,60 +170,105 @@ async def health_check():
     }
 
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(file: UploadFile = File(...)):
-    """
-    Predict tumor type from MRI image
+async def _start_timer() -> int:
+    """Mark the start of request processing (resolved before decoding)"""
+    return time.perf_counter_ns()
 
-    Args:
-        file: Uploaded MRI image file (jpg, png, jpeg)
 
-    Returns:
-        Prediction results with class, confidence, and probabilities
-    """
-    start_time = datetime.now()
+async def _read_upload(file: UploadFile, limit: int) -> bytes:
+    """Read an uploaded file, rejecting it once it exceeds limit bytes"""
+    if file.size is not None and file.size > limit:
+        raise HTTPException(
+            status_code=413, detail="Upload exceeds maximum allowed size"
+        )
+
+    image_bytes = await file.read(limit + 1)
+    if len(image_bytes) > limit:
+        raise HTTPException(
+            status_code=413, detail="Upload exceeds maximum allowed size"
+        )
+    return image_bytes
+
 
+async def _decode(image_bytes: bytes) -> torch.Tensor:
+    """Decode and preprocess an image in the decode pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        decode_pool, model_loader.preprocess_bytes, image_bytes
+    )
+
+
+async def _decoded_upload(file: UploadFile = File(...)) -> torch.Tensor:
+    """Validate a single uploaded image and decode it"""
     # Validate file type
     if not file.content_type.startswith("image/"):
         raise HTTPException(
             status_code=400, detail="File must be an image (jpg, png, jpeg)"
         )
 
+    image_bytes = await _read_upload(file, MAX_UPLOAD_BYTES)
+
     try:
-        # Read and preprocess image
-        image_bytes = await file.read()
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        return await _decode(image_bytes)
+    except Exception as e:
+        logger.error(f"Prediction error: {str(e)}")
+        metrics_collector.record_error()
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
-        # Make prediction
-        prediction = model_loader.predict(image)
 
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+async def _decoded_uploads(files: List[UploadFile] = File(...)) -> List[torch.Tensor]:
+    """Validate a batch of uploaded images and decode them concurrently"""
+    if len(files) > 10:
+        raise HTTPException(
+            status_code=400, detail="Maximum 10 images allowed per batch"
+        )
 
-        # Generate prediction ID
-        prediction_id = f"pred_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    image_files = []
+    remaining_bytes = MAX_UPLOAD_BYTES
+    for file in files:
+        if not file.content_type.startswith("image/"):
+            logger.error(f"Batch prediction error for {file.filename}: not an image")
+            continue
+        image_bytes = await _read_upload(file, remaining_bytes)
+        remaining_bytes -= len(image_bytes)
+        image_files.append((file.filename, image_bytes))
+
+    decoded = await asyncio.gather(
+        *[_decode(data) for _, data in image_files], return_exceptions=True
+    )
+
+    image_tensors = []
+    for (filename, _), result in zip(image_files, decoded):
+        if isinstance(result, Exception):
+            logger.error(f"Batch prediction error for {filename}: {str(result)}")
+            continue
+        image_tensors.append(result)
 
-        # Log prediction for monitoring
-        log_prediction(
-            prediction_id=prediction_id,
-            predicted_class=prediction["class"],
-            confidence=prediction["confidence"],
-            processing_time_ms=processing_time,
-        )
+    return image_tensors
 
-        # Update metrics
-        metrics_collector.record_prediction(
-            prediction["class"], prediction["confidence"], processing_time
-        )
 
-        return {
-            "predicted_class": prediction["class"],
-            "confidence": prediction["confidence"],
-            "probabilities": prediction["probabilities"],
-            "prediction_id": prediction_id,
-            "timestamp": datetime.now().isoformat(),
-            "processing_time_ms": round(processing_time, 2),
-        }
+@app.post("/predict", response_model=PredictionResponse)
+async def predict(
+    start_ns: int = Depends(_start_timer),
+    image_tensor: torch.Tensor = Depends(_decoded_upload),
+):
+    """
+    Predict tumor type from MRI image
+
+    Args:
+        file: Uploaded MRI image file (jpg, png, jpeg)
+
+    Returns:
+        Prediction results with class, confidence, and probabilities
+    """
+    try:
+        # Make prediction, coalesced with concurrent requests when possible
+        if micro_batcher.is_running():
+            prediction = await micro_batcher.submit(image_tensor)
+        else:
+            prediction = model_loader.predict_batch([image_tensor])[0]
+
+        return _build_response(prediction, start_ns)
 
     except Exception as e:
         logger.error(f"Prediction error: {str(e)}")
@@ -175,8 +276,44 @@ async def predict(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+def _build_response(prediction: Dict, start_ns: int) -> Dict:
+    """Log and record a prediction, then build its API response"""
+    # Calculate processing time
+    processing_time = (time.perf_counter_ns() - start_ns) / 1e6
+
+    # Generate prediction ID (one wall-clock read shared by ID, log and response)
+    now = datetime.now()
+    prediction_id = f"pred_{now.strftime('%Y%m%d_%H%M%S_%f')}"
+
+    # Log prediction for monitoring
+    log_prediction(
+        prediction_id=prediction_id,
+        predicted_class=prediction["class"],
+        confidence=prediction["confidence"],
+        processing_time_ms=processing_time,
+        timestamp=now,
+    )
+
+    # Update metrics
+    metrics_collector.record_prediction(
+        prediction["class"], prediction["confidence"], processing_time, timestamp=now
+    )
+
+    return {
+        "predicted_class": prediction["class"],
+        "confidence": prediction["confidence"],
+        "probabilities": prediction["probabilities"],
+        "prediction_id": prediction_id,
+        "timestamp": now.isoformat(),
+        "processing_time_ms": round(processing_time, 2),
+    }
+
+
 @app.post("/batch_predict", response_model=List[PredictionResponse])
-async def batch_predict(files: List[UploadFile] = File(...)):
+async def batch_predict(
+    start_ns: int = Depends(_start_timer),
+    image_tensors: List[torch.Tensor] = Depends(_decoded_uploads),
+):
     """
     Batch prediction for multiple MRI images
 
@@ -186,21 +323,19 @@ async def batch_predict(files: List[UploadFile] = File(...)):
     Returns:
         List of prediction results
     """
-    if len(files) > 10:
-        raise HTTPException(
-            status_code=400, detail="Maximum 10 images allowed per batch"
-        )
+    if not image_tensors:
+        return []
 
-    results = []
-    for file in files:
-        try:
-            result = await predict(file)
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Batch prediction error for {file.filename}: {str(e)}")
-            continue
+    # Run all images through the model in a single forward pass
+    try:
+        predictions = await asyncio.to_thread(model_loader.predict_batch, image_tensors)
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        for _ in image_tensors:
+            metrics_collector.record_error()
+        return []
 
-    return results
+    return [_build_response(prediction, start_ns) for prediction in predictions]
 
 
 @app.get("/metrics")
@@ -213,7 +348,8 @@ async def get_metrics():
 async def reload_model():
     """Reload the model (useful for model updates)"""
     try:
-        model_loader.reload_model()
+        if not model_loader.reload_model():
+            return {"status": "unchanged", "message": "Model file unchanged"}
         return {"status": "success", "message": "Model reloaded successfully"}
     except Exception as e:
         logger.error(f"Model reload failed: {str(e)}")
@@ -223,4 +359,16 @@ async def reload_model():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Resolve the worker count once; workers inherit it and size their
+    # torch thread pools from it (see ModelLoader). Every worker holds its
+    # own model replica, so a single GPU is shared by one worker only.
+    default_workers = 1 if torch.cuda.is_available() else os.cpu_count() or 1
+    os.environ.setdefault("WEB_CONCURRENCY", str(default_workers))
+
+    # Each worker is a separate process with its own model replica
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ["WEB_CONCURRENCY"]),
+    )
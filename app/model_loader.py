@@ -2,17 +2,127 @@
 Model Loader Module
 Handles model loading, caching, and inference
 """
+import io
 import logging
 import os
+import pickle
+import threading
 import time
-from typing import Dict
+from bisect import bisect_left
+from typing import Dict, List
 
 import torch
-import torchvision.transforms as transforms
 from PIL import Image
+from torch.nn.utils.fusion import fuse_conv_bn_eval, fuse_linear_bn_eval
+from torchvision.io import ImageReadMode, decode_jpeg
+from torchvision.transforms import v2 as transforms
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "8"))
+JPEG_MAGIC = b"\xff\xd8\xff"
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
+
+JIT_WARMUP_RUNS = int(os.getenv("JIT_WARMUP_RUNS", "3"))
+
+# ONNX Runtime execution providers, fastest first
+ONNX_PROVIDERS = [
+    "TensorrtExecutionProvider",
+    "CUDAExecutionProvider",
+    "CPUExecutionProvider",
+]
+
+
+def add_input_normalization(model: torch.nn.Module) -> torch.nn.Sequential:
+    """
+    Prepend ImageNet mean/std normalization to a model as a frozen 1x1 conv
+
+    A depthwise 1x1 conv computes (x - mean) / std exactly and becomes part
+    of the model graph, so compilers can fuse it into the first convolution.
+    (Folding it into the first conv's weights directly would be inexact at
+    the borders, where that conv zero-pads.)
+
+    Args:
+        model: Model expecting normalized input
+
+    Returns:
+        Model expecting [0, 1] scaled input
+    """
+    mean = torch.tensor(IMAGENET_MEAN)
+    std = torch.tensor(IMAGENET_STD)
+
+    normalize = torch.nn.Conv2d(3, 3, kernel_size=1, groups=3)
+    with torch.no_grad():
+        normalize.weight.copy_((1.0 / std).view(3, 1, 1, 1))
+        normalize.bias.copy_(-mean / std)
+    normalize.requires_grad_(False)
+
+    return torch.nn.Sequential(normalize, model)
+
+
+def fold_bn_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Fold BatchNorm layers into the Linear/Conv2d layer preceding them
+
+    Every (Linear, BatchNorm1d) and (Conv2d, BatchNorm2d) pair inside an
+    nn.Sequential is replaced by a single layer with the BatchNorm affine
+    transform baked into its weight and bias, and the BatchNorm slot becomes
+    nn.Identity. This is the eager-mode equivalent of what torch.jit.freeze
+    does for TorchScript models.
+
+    Args:
+        model: Model in eval mode (running statistics are used)
+
+    Returns:
+        The same model, modified in place
+    """
+    for module in model.modules():
+        if not isinstance(module, torch.nn.Sequential):
+            continue
+        for i in range(len(module) - 1):
+            layer, bn = module[i], module[i + 1]
+            if isinstance(layer, torch.nn.Linear) and isinstance(
+                bn, torch.nn.BatchNorm1d
+            ):
+                module[i] = fuse_linear_bn_eval(layer, bn)
+                module[i + 1] = torch.nn.Identity()
+            elif isinstance(layer, torch.nn.Conv2d) and isinstance(
+                bn, torch.nn.BatchNorm2d
+            ):
+                module[i] = fuse_conv_bn_eval(layer, bn)
+                module[i + 1] = torch.nn.Identity()
+    return model
+
+
+def freeze_model(
+    model: torch.nn.Module, optimize_for_inference: bool = False
+) -> torch.jit.ScriptModule:
+    """
+    Script and freeze an eval-mode model for deployment
+
+    Freezing inlines the weights as constants, folds BatchNorm into the
+    preceding convolutions and removes dropout from the graph.
+
+    Args:
+        model: Model in eval mode
+        optimize_for_inference: Also run torch.jit.optimize_for_inference
+            (experimental, off by default)
+
+    Returns:
+        Frozen TorchScript module
+    """
+    frozen = torch.jit.freeze(torch.jit.script(model))
+    if optimize_for_inference:
+        frozen = torch.jit.optimize_for_inference(frozen)
+    return frozen
+
+
+def _threads_per_worker() -> int:
+    """Split CPU cores evenly between uvicorn worker processes"""
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    return max(1, (os.cpu_count() or 1) // workers)
+
 
 class ModelLoader:
     """Handle model loading and inference"""
@@ -30,19 +140,63 @@ class ModelLoader:
                 base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
                 self.model_path = os.path.join(base_path, "models", "best_model.pth")
         self.model = None
+        self.session = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.class_names = ["glioma", "meningioma", "no_tumor", "pituitary"]
         self.version = "1.0.0"
         self.load_time = None
+        self._last_stat = None
+
+        # Each worker process holds its own model replica; avoid oversubscribing
+        # cores when several workers run intra-op thread pools side by side
+        self.num_threads = int(os.getenv("TORCH_NUM_THREADS", _threads_per_worker()))
+        torch.set_num_threads(self.num_threads)
+
+        # Graph optimization: "none" (eager), "script" (TorchScript) or "compile"
+        self.compile_mode = os.getenv("MODEL_COMPILE", "none").lower()
+        self._dynamic_batch = False
+        self.optimize_for_inference = (
+            os.getenv("MODEL_OPTIMIZE_FOR_INFERENCE", "false").lower() == "true"
+        )
+
+        # bf16 autocast on CPU only pays off with AVX-512 BF16 / AMX support
+        self.cpu_bf16 = os.getenv("CPU_BF16", "false").lower() == "true"
 
-        # Image preprocessing transforms
+        # Skip TorchScript's profiling executor to trade peak throughput for
+        # a fast first call after (re)load
+        if os.getenv("JIT_PROFILING", "true").lower() == "false":
+            torch._C._jit_set_profiling_mode(False)
+
+        # Use Intel Extension for PyTorch on CPU when it is installed
+        self.use_ipex = os.getenv("USE_IPEX", "true").lower() == "true"
+
+        # Batch sizes captured as CUDA graphs (smaller batches are padded up)
+        self.cuda_graph_sizes = sorted(
+            int(bs)
+            for bs in os.getenv("CUDA_GRAPH_BATCH_SIZES", "1,2,4,8").split(",")
+            if bs.strip()
+        )
+        self._graphs = {}
+        self._graph_lock = threading.Lock()
+
+        # Let fp32 matmuls/convolutions use TF32 tensor cores
+        if self.device.type == "cuda":
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+
+        # Pinned staging buffer for asynchronous host-to-device copies, created
+        # in load_model() so processes that never serve don't allocate it
+        self._pinned = None
+        self._copy_stream = None
+        self._staging_event = None
+        self._staging_lock = threading.Lock()
+
+        # Image preprocessing transforms (normalization is part of the model)
         self.transform = transforms.Compose(
             [
-                transforms.Resize((224, 224)),
-                transforms.ToTensor(),
-                transforms.Normalize(
-                    mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]
-                ),
+                transforms.Resize((224, 224), antialias=True),
+                transforms.ToImage(),
+                transforms.ToDtype(torch.float32, scale=True),
             ]
         )
 
@@ -56,37 +210,28 @@ class ModelLoader:
             if not os.path.exists(self.model_path):
                 raise FileNotFoundError(f"Model not found at {self.model_path}")
 
-            # Load model checkpoint
-            checkpoint = torch.load(
-                self.model_path, map_location=self.device, weights_only=False
-            )
-
-            # Initialize model architecture
-            from .model_architecture import BrainTumorCNN
-
-            self.model = BrainTumorCNN(
-                num_classes=len(self.class_names), pretrained=False
-            )
-
-            # Load state dict
-            if "model_state_dict" in checkpoint:
-                self.model.load_state_dict(checkpoint["model_state_dict"])
-                logger.info("Loaded model from checkpoint with model_state_dict_key")
-
-                # Extract additional info if available
-                if "class_names" in checkpoint:
-                    logger.info(f"Checkpoint classes: {checkpoint['class_names']}")
-                if "best_val_acc" in checkpoint:
-                    logger.info(
-                        f"Best validation accuracy: {checkpoint['best_val_acc']:.4f}"
+            if self.model_path.endswith(".onnx"):
+                try:
+                    self._load_onnx_session()
+                except ImportError:
+                    # Fall back to the PyTorch checkpoint the export was made from
+                    self.model_path = os.path.splitext(self.model_path)[0] + ".pth"
+                    logger.warning(
+                        f"onnxruntime is not installed, serving {self.model_path}"
                     )
+                    self.model = self.build_model(self.device)
+                    self._optimize_model()
+            elif self.model_path.endswith(".pt"):
+                self._load_torchscript()
             else:
-                self.model.load_state_dict(checkpoint)
-                logger.info("Loaded model from checkpoint (direct state_dict)")
+                self.model = self.build_model(self.device)
+                self._optimize_model()
 
-            self.model.to(self.device)
-            self.model.eval()
+            if self.device.type == "cuda" and self._pinned is None:
+                self._pinned = torch.empty(MAX_BATCH_SIZE, 3, 224, 224).pin_memory()
+                self._copy_stream = torch.cuda.Stream()
 
+            self._last_stat = self._model_file_stat()
             self.load_time = time.time()
             load_duration = time.time() - start_time
 
@@ -96,6 +241,338 @@ class ModelLoader:
             logger.error(f"Failed to load model: {str(e)}")
             raise
 
+    def build_model(self, device: torch.device) -> torch.nn.Module:
+        """
+        Build the eager PyTorch model from the checkpoint at model_path
+
+        Args:
+            device: Device to load the weights onto
+
+        Returns:
+            Model in eval mode taking [0, 1] scaled input, without any
+            inference optimizations applied
+        """
+        # Load model checkpoint (memory-mapped, without arbitrary unpickling)
+        try:
+            checkpoint = torch.load(
+                self.model_path, map_location=device, weights_only=True, mmap=True
+            )
+        except pickle.UnpicklingError:
+            # Training checkpoints may also store non-tensor objects
+            # (e.g. the label encoder), which weights_only refuses to load
+            logger.info("Checkpoint has non-tensor objects, using full unpickling")
+            checkpoint = torch.load(
+                self.model_path, map_location=device, weights_only=False, mmap=True
+            )
+
+        # Initialize model architecture
+        from .model_architecture import BrainTumorCNN
+
+        model = BrainTumorCNN(num_classes=len(self.class_names), pretrained=False)
+
+        # Load state dict
+        if "model_state_dict" in checkpoint:
+            model.load_state_dict(checkpoint["model_state_dict"])
+            logger.info("Loaded model from checkpoint with model_state_dict_key")
+
+            # Extract additional info if available
+            if "class_names" in checkpoint:
+                logger.info(f"Checkpoint classes: {checkpoint['class_names']}")
+            if "best_val_acc" in checkpoint:
+                logger.info(
+                    f"Best validation accuracy: {checkpoint['best_val_acc']:.4f}"
+                )
+        else:
+            model.load_state_dict(checkpoint)
+            logger.info("Loaded model from checkpoint (direct state_dict)")
+
+        model.strip_for_inference()
+        model = add_input_normalization(model)
+        model.to(device)
+        model.eval()
+        fold_bn_for_inference(model)
+        return model
+
+    def _load_onnx_session(self):
+        """Load an ONNX export of the model into an ONNX Runtime session"""
+        import onnxruntime as ort
+
+        sess_options = ort.SessionOptions()
+        sess_options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        sess_options.intra_op_num_threads = self.num_threads
+
+        self.session = ort.InferenceSession(
+            self.model_path,
+            sess_options=sess_options,
+            providers=self._onnx_providers(ort.get_available_providers()),
+        )
+
+        # Inputs are fed as host arrays, so preprocessing stays on the CPU
+        self.device = torch.device("cpu")
+
+        logger.info(
+            f"Loaded ONNX model with ONNX Runtime ({self.session.get_providers()[0]})"
+        )
+
+    def _onnx_providers(self, available: List[str]) -> List:
+        """Pick execution providers in preference order (ONNX_PROVIDERS overrides)"""
+        requested = os.getenv("ONNX_PROVIDERS")
+        if requested:
+            names = [name.strip() for name in requested.split(",") if name.strip()]
+        else:
+            names = [name for name in ONNX_PROVIDERS if name in available]
+
+        providers = []
+        for name in names:
+            if name == "TensorrtExecutionProvider":
+                # Build fp16 engines once and reuse them across restarts
+                options = {
+                    "trt_fp16_enable": True,
+                    "trt_engine_cache_enable": True,
+                    "trt_engine_cache_path": os.path.dirname(self.model_path),
+                }
+                providers.append((name, options))
+            else:
+                providers.append(name)
+        return providers
+
+    def _load_torchscript(self):
+        """Load a prebuilt TorchScript artifact (e.g. the int8 quantized model)"""
+        self.model = torch.jit.load(self.model_path, map_location=self.device)
+        self.model.eval()
+        self._warm_up()
+
+        logger.info("Loaded TorchScript model")
+
+    def _warm_up(self):
+        """Run a dummy forward so the first request doesn't pay JIT/compilation cost"""
+        dummy_input = torch.zeros(1, 3, 224, 224, device=self.device).to(
+            memory_format=torch.channels_last
+        )
+        # TorchScript's profiling executor optimizes the graph only after it
+        # has profiled a few runs, so JIT models get several warm-up passes
+        runs = JIT_WARMUP_RUNS if isinstance(self.model, torch.jit.ScriptModule) else 1
+        with torch.inference_mode(), self._autocast():
+            for _ in range(runs):
+                self.model(dummy_input)
+
+    def _optimize_model(self):
+        """Apply inference-time layout, precision and graph optimizations"""
+        # NHWC lets cuDNN/oneDNN pick their fastest convolution kernels
+        self.model = self.model.to(memory_format=torch.channels_last)
+
+        if self.device.type == "cuda":
+            self.model.half()
+            # Benchmark cuDNN conv algorithms for the serving shapes while
+            # warming up; the CUDA graphs captured below keep those choices
+            torch.backends.cudnn.benchmark = True
+
+        self._compile_model()
+        self._warm_up()
+
+        # torch.compile's reduce-overhead mode already manages its own graphs
+        if self.device.type == "cuda" and self.compile_mode != "compile":
+            self._capture_cuda_graphs()
+
+        if self.device.type == "cuda":
+            # No more algorithm searches (and latency spikes) once serving
+            torch.backends.cudnn.benchmark = False
+
+        logger.info(f"Model optimized (compile mode: {self.compile_mode})")
+
+    def _compile_model(self):
+        """Replace the eager model with a fused/compiled graph where configured"""
+        if self.device.type == "cpu" and self.use_ipex and self._optimize_with_ipex():
+            return
+
+        if self.compile_mode == "script":
+            frozen = freeze_model(self.model, self.optimize_for_inference)
+            if self._same_top1(self.model, frozen):
+                self.model = frozen
+            else:
+                logger.warning("Frozen model disagrees with eager model, using eager")
+        elif self.compile_mode == "compile":
+            # Bound recompiles when the micro-batcher sends new batch sizes
+            torch._dynamo.config.cache_size_limit = 16
+            self.model = torch.compile(
+                self.model, mode="reduce-overhead", fullgraph=True, backend="inductor"
+            )
+            self._dynamic_batch = True
+        elif self.compile_mode != "none":
+            logger.warning(f"Unknown MODEL_COMPILE mode: {self.compile_mode}")
+
+    def _same_top1(
+        self, reference: torch.nn.Module, candidate: torch.nn.Module
+    ) -> bool:
+        """Check that an optimized model predicts the same classes as the eager one"""
+        generator = torch.Generator().manual_seed(0)
+        inputs = torch.rand(4, 3, 224, 224, generator=generator)
+        inputs = inputs.to(self.device, memory_format=torch.channels_last)
+        with torch.inference_mode(), self._autocast():
+            expected = reference(inputs).argmax(dim=1)
+            actual = candidate(inputs).argmax(dim=1)
+        return torch.equal(expected, actual)
+
+    def _optimize_with_ipex(self) -> bool:
+        """Fuse the model with Intel Extension for PyTorch (oneDNN graph)"""
+        try:
+            import intel_extension_for_pytorch as ipex
+        except ImportError:
+            return False
+
+        if self.compile_mode != "none":
+            logger.warning(
+                f"MODEL_COMPILE={self.compile_mode} ignored, using IPEX "
+                "(set USE_IPEX=false to use it)"
+            )
+
+        # bf16 only where CPU_BF16 says the hardware supports it natively
+        dtype = torch.bfloat16 if self.cpu_bf16 else torch.float32
+        self.model = ipex.optimize(self.model, dtype=dtype)
+        example_input = torch.randn(1, 3, 224, 224).to(
+            memory_format=torch.channels_last
+        )
+        with torch.cpu.amp.autocast(enabled=self.cpu_bf16), torch.no_grad():
+            self.model = torch.jit.trace(self.model, example_input)
+            self.model = torch.jit.freeze(self.model)
+
+        logger.info(f"Model optimized with Intel Extension for PyTorch ({dtype})")
+        return True
+
+    def _capture_cuda_graphs(self):
+        """Capture the forward pass as a CUDA graph for each configured batch size"""
+        self._graphs = {}
+        static_inputs = {
+            bs: torch.zeros(
+                bs, 3, 224, 224, device=self.device, dtype=torch.float16
+            ).to(memory_format=torch.channels_last)
+            for bs in self.cuda_graph_sizes
+        }
+
+        # Warm up on a side stream so capture sees initialized cuDNN/cuBLAS state
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), torch.inference_mode():
+            for static_input in static_inputs.values():
+                for _ in range(3):
+                    self.model(static_input)
+        torch.cuda.current_stream().wait_stream(stream)
+
+        with torch.inference_mode():
+            for bs, static_input in static_inputs.items():
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    static_output = self.model(static_input)
+                self._graphs[bs] = (graph, static_input, static_output)
+
+        logger.info(f"Captured CUDA graphs for batch sizes {self.cuda_graph_sizes}")
+
+    def _forward(self, batch: torch.Tensor) -> torch.Tensor:
+        """Run the model, replaying a captured CUDA graph when one fits the batch"""
+        if self.session is not None:
+            outputs = self.session.run(None, {"input": batch.contiguous().numpy()})
+            return torch.from_numpy(outputs[0])
+
+        actual_bs = batch.size(0)
+        if self._dynamic_batch and actual_bs > 1:
+            # One compiled graph for all batch sizes instead of one per size
+            # (size-1 batches are always specialized by dynamo)
+            torch._dynamo.mark_dynamic(batch, 0)
+
+        if not self._graphs or actual_bs > self.cuda_graph_sizes[-1]:
+            return self.model(batch)
+
+        bs = self.cuda_graph_sizes[bisect_left(self.cuda_graph_sizes, actual_bs)]
+        graph, static_input, static_output = self._graphs[bs]
+
+        # Static buffers are shared, so only one replay may be in flight
+        with self._graph_lock:
+            static_input[:actual_bs].copy_(batch)
+            graph.replay()
+            return static_output[:actual_bs].clone()
+
+    def _autocast(self):
+        """Mixed-precision context: fp16 on CUDA, bf16 on CPU when enabled"""
+        if self.device.type == "cuda":
+            return torch.autocast(device_type="cuda", dtype=torch.float16)
+        return torch.autocast(
+            device_type="cpu", dtype=torch.bfloat16, enabled=self.cpu_bf16
+        )
+
+    def preprocess(self, image: Image.Image) -> torch.Tensor:
+        """
+        Convert a PIL image into an un-normalized (3, 224, 224) tensor
+
+        Args:
+            image: PIL Image object
+
+        Returns:
+            Float tensor scaled to [0, 1], ready to be batched
+        """
+        return self.transform(image)
+
+    def preprocess_bytes(self, image_bytes: bytes) -> torch.Tensor:
+        """
+        Decode an encoded image and convert it into a (3, 224, 224) tensor
+
+        JPEGs are decoded straight into a uint8 tensor with libjpeg-turbo, or
+        on the GPU with nvJPEG when CUDA is available; everything else (and
+        any JPEG torchvision can't handle) goes through PIL.
+
+        Args:
+            image_bytes: Raw bytes of an uploaded image file
+
+        Returns:
+            Float tensor scaled to [0, 1], ready to be batched
+        """
+        if image_bytes[:3] == JPEG_MAGIC:
+            data = torch.frombuffer(bytearray(image_bytes), dtype=torch.uint8)
+            try:
+                image = decode_jpeg(data, mode=ImageReadMode.RGB, device=self.device)
+                return self.transform(image)
+            except RuntimeError as e:
+                logger.debug(f"torchvision JPEG decode failed, using PIL: {str(e)}")
+
+        return self.preprocess(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+
+    def _to_device(self, image_tensors: List[torch.Tensor]) -> torch.Tensor:
+        """Stack preprocessed images and move them to the model device"""
+        # Compare device types: decoded tensors report "cuda:0" while
+        # self.device is the index-less "cuda"
+        on_device = [t.device.type == self.device.type for t in image_tensors]
+        if all(on_device):
+            return torch.stack(image_tensors)
+        if any(on_device):
+            return torch.stack([t.to(self.device) for t in image_tensors])
+
+        if len(image_tensors) > MAX_BATCH_SIZE:
+            return (
+                torch.stack(image_tensors)
+                .pin_memory()
+                .to(self.device, non_blocking=True)
+            )
+
+        with self._staging_lock:
+            # Don't overwrite the staging buffer while a previous copy is in flight
+            if self._staging_event is not None:
+                self._staging_event.synchronize()
+
+            staging = self._pinned[: len(image_tensors)]
+            torch.stack(image_tensors, out=staging)
+
+            with torch.cuda.stream(self._copy_stream):
+                batch = staging.to(self.device, non_blocking=True)
+                self._staging_event = torch.cuda.Event()
+                self._staging_event.record()
+
+            # Compute waits on the copy without blocking the host
+            torch.cuda.current_stream().wait_event(self._staging_event)
+            batch.record_stream(torch.cuda.current_stream())
+
+        return batch
+
     def predict(self, image: Image.Image) -> Dict:
         """
         Make prediction on a single image
@@ -106,48 +583,83 @@ class ModelLoader:
         Returns:
             Dictionary with prediction results
         """
-        if self.model is None:
+        return self.predict_batch([self.preprocess(image)])[0]
+
+    def predict_batch(self, image_tensors: List[torch.Tensor]) -> List[Dict]:
+        """
+        Make predictions on a batch of preprocessed images in one forward pass
+
+        Args:
+            image_tensors: List of tensors returned by preprocess()
+
+        Returns:
+            List of dictionaries with prediction results, in input order
+        """
+        if not self.is_loaded():
             raise RuntimeError("Model not loaded")
 
         try:
-            # Preprocess image
-            image_tensor = self.transform(image).unsqueeze(0).to(self.device)
+            # Stack on the model device
+            batch = self._to_device(image_tensors)
+            batch = batch.to(memory_format=torch.channels_last)
 
             # Make prediction
-            with torch.no_grad():
-                outputs = self.model(image_tensor)
+            with torch.inference_mode(), self._autocast():
+                outputs = self._forward(batch)
                 probabilities = torch.nn.functional.softmax(outputs, dim=1)
-                confidence, predicted_idx = torch.max(probabilities, 1)
 
-            # Get class name and probabilities
-            predicted_class = self.class_names[predicted_idx.item()]
-            confidence_score = confidence.item()
+            # Copy all probabilities to the host with a single sync
+            batch_probs = probabilities.float().cpu().tolist()
 
-            # Create probability dictionary
-            probs_dict = {
-                self.class_names[i]: float(probabilities[0][i])
-                for i in range(len(self.class_names))
-            }
+            results = []
+            for probs in batch_probs:
+                predicted_idx = max(range(len(probs)), key=probs.__getitem__)
 
-            return {
-                "class": predicted_class,
-                "confidence": confidence_score,
-                "probabilities": probs_dict,
-            }
+                results.append(
+                    {
+                        "class": self.class_names[predicted_idx],
+                        "confidence": probs[predicted_idx],
+                        "probabilities": dict(zip(self.class_names, probs)),
+                    }
+                )
+
+            return results
 
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
             raise
 
-    def reload_model(self):
-        """Reload the model"""
+    def _model_file_stat(self):
+        """Get (mtime, size) of the model file to detect changes"""
+        stat = os.stat(self.model_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_model(self) -> bool:
+        """
+        Reload the model, skipping the reload if the file is unchanged
+
+        Returns:
+            True if the model was reloaded, False if the reload was skipped
+        """
+        if (
+            self.is_loaded()
+            and os.path.exists(self.model_path)
+            and self._model_file_stat() == self._last_stat
+        ):
+            logger.info("Model file unchanged, skipping reload")
+            return False
+
         logger.info("Reloading model...")
         self.model = None
+        self.session = None
+        self._graphs = {}
+        self._dynamic_batch = False
         self.load_model()
+        return True
 
     def is_loaded(self) -> bool:
         """Check if model is loaded"""
-        return self.model is not None
+        return self.model is not None or self.session is not None
 
     def get_version(self) -> str:
         """Get model version"""
@@ -2,12 +2,15 @@
 Monitoring Module
 Track predictions, performance metrics, and system health
 """
-import json
+import asyncio
 import logging
+import os
 import threading
 from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -27,20 +30,40 @@ class MetricsCollector:
         self.processing_times = deque(maxlen=max_history)
         self.predictions_history = deque(maxlen=max_history)
 
+        # Running aggregates over the history window (O(1) per update/query)
+        self._conf_sum = 0.0
+        self._time_sum = 0.0
+        self._sample_index = 0
+        self._time_min_dq = deque()  # (index, time), increasing times
+        self._time_max_dq = deque()  # (index, time), decreasing times
+
         # Time-based metrics
         self.start_time = datetime.now()
         self.last_prediction_time = None
 
     def record_prediction(
-        self, predicted_class: str, confidence: float, processing_time: float
+        self,
+        predicted_class: str,
+        confidence: float,
+        processing_time: float,
+        timestamp: Optional[datetime] = None,
     ):
         """Record a successful prediction"""
         with self.lock:
             self.total_predictions += 1
             self.class_distribution[predicted_class] += 1
+
+            # Subtract values about to be evicted from the history window
+            if len(self.confidence_scores) == self.max_history:
+                self._conf_sum -= self.confidence_scores[0]
+                self._time_sum -= self.processing_times[0]
             self.confidence_scores.append(confidence)
             self.processing_times.append(processing_time)
-            self.last_prediction_time = datetime.now()
+            self._conf_sum += confidence
+            self._time_sum += processing_time
+            self._update_time_extremes(processing_time)
+
+            self.last_prediction_time = timestamp or datetime.now()
 
             # Store prediction details
             self.predictions_history.append(
@@ -52,6 +75,24 @@ class MetricsCollector:
                 }
             )
 
+    def _update_time_extremes(self, processing_time: float):
+        """Maintain monotonic deques for the sliding-window min and max"""
+        index = self._sample_index
+        self._sample_index += 1
+        window_start = index - self.max_history + 1
+
+        while self._time_min_dq and self._time_min_dq[-1][1] >= processing_time:
+            self._time_min_dq.pop()
+        self._time_min_dq.append((index, processing_time))
+        if self._time_min_dq[0][0] < window_start:
+            self._time_min_dq.popleft()
+
+        while self._time_max_dq and self._time_max_dq[-1][1] <= processing_time:
+            self._time_max_dq.pop()
+        self._time_max_dq.append((index, processing_time))
+        if self._time_max_dq[0][0] < window_start:
+            self._time_max_dq.popleft()
+
     def record_error(self):
         """Record an error"""
         with self.lock:
@@ -71,19 +112,18 @@ class MetricsCollector:
                 else 0,
                 "error_rate": self.total_errors / max(self.total_predictions, 1),
                 "class_distribution": dict(self.class_distribution),
-                "average_confidence": sum(self.confidence_scores)
-                / len(self.confidence_scores)
+                "average_confidence": self._conf_sum / len(self.confidence_scores)
                 if self.confidence_scores
                 else 0,
-                "average_processing_time_ms": sum(self.processing_times)
+                "average_processing_time_ms": self._time_sum
                 / len(self.processing_times)
                 if self.processing_times
                 else 0,
-                "min_processing_time_ms": min(self.processing_times)
-                if self.processing_times
+                "min_processing_time_ms": self._time_min_dq[0][1]
+                if self._time_min_dq
                 else 0,
-                "max_processing_time_ms": max(self.processing_times)
-                if self.processing_times
+                "max_processing_time_ms": self._time_max_dq[0][1]
+                if self._time_max_dq
                 else 0,
                 "last_prediction_time": self.last_prediction_time.isoformat()
                 if self.last_prediction_time
@@ -98,11 +138,107 @@ class MetricsCollector:
             return list(self.predictions_history)[-n:]
 
 
+class PredictionLogWriter:
+    """Write prediction log entries to daily JSONL files in batches"""
+
+    def __init__(
+        self,
+        log_dir: str = "/app/logs",
+        max_batch_size: int = 100,
+        flush_interval: float = 0.1,
+    ):
+        self.log_dir = log_dir
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._log_date = None
+        self._log_file = None
+
+    def start(self):
+        """Start the background writer task on the running event loop"""
+        if self.is_running():
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._writer())
+
+    async def stop(self):
+        """Stop the writer task, flushing any queued entries"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        if remaining:
+            self._write_batch(remaining)
+
+        self._task = None
+        self._queue = None
+
+    def is_running(self) -> bool:
+        """Check if the writer task is running"""
+        return self._task is not None and not self._task.done()
+
+    def write(self, log_entry: Dict):
+        """Queue a log entry, or write it directly if the writer isn't running"""
+        if self.is_running():
+            self._queue.put_nowait(log_entry)
+        else:
+            self._write_batch([log_entry])
+
+    async def _writer(self):
+        """Background loop flushing up to max_batch_size entries at a time"""
+        while True:
+            batch = [await self._queue.get()]
+
+            # Let more entries accumulate, then drain them without blocking.
+            # asyncio.wait_for is avoided since it can swallow cancellation.
+            if self._queue.qsize() < self.max_batch_size - 1:
+                try:
+                    await asyncio.sleep(self.flush_interval)
+                except asyncio.CancelledError:
+                    self._write_batch(batch)
+                    raise
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Keep filesystem stalls off the event loop
+            await asyncio.to_thread(self._write_batch, batch)
+
+    def _current_log_file(self) -> str:
+        """Get today's log file, creating the directory when the date rolls over"""
+        today = datetime.now().strftime("%Y%m%d")
+        if today != self._log_date:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._log_file = os.path.join(self.log_dir, f"predictions_{today}.jsonl")
+            self._log_date = today
+        return self._log_file
+
+    def _write_batch(self, log_entries: List[Dict]):
+        """Append log entries to today's file in a single write"""
+        try:
+            with open(self._current_log_file(), "ab") as f:
+                f.write(b"".join(orjson.dumps(entry) + b"\n" for entry in log_entries))
+
+        except Exception as e:
+            logger.error(f"Failed to log prediction: {str(e)}")
+
+
+prediction_log_writer = PredictionLogWriter()
+
+
 def log_prediction(
     prediction_id: str,
     predicted_class: str,
     confidence: float,
     processing_time_ms: float,
+    timestamp: Optional[datetime] = None,
 ):
     """
     Log prediction to file for monitoring and analysis
@@ -112,31 +248,17 @@ def log_prediction(
         predicted_class: Predicted tumor class
         confidence: Prediction confidence score
         processing_time_ms: Processing time in milliseconds
+        timestamp: Time of the prediction (defaults to now)
     """
     log_entry = {
         "prediction_id": prediction_id,
         "predicted_class": predicted_class,
         "confidence": confidence,
         "processing_time_ms": processing_time_ms,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": (timestamp or datetime.now()).isoformat(),
     }
 
-    try:
-        # Log to file (create logs directory if needed)
-        import os
-
-        log_dir = "/app/logs"
-        os.makedirs(log_dir, exist_ok=True)
-
-        log_file = os.path.join(
-            log_dir, f"predictions_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        )
-
-        with open(log_file, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
-
-    except Exception as e:
-        logger.error(f"Failed to log prediction: {str(e)}")
+    prediction_log_writer.write(log_entry)
 
 
 class ModelMonitor:
@@ -0,0 +1,57 @@
+"""
+ONNX Export Script
+Exports the trained model to ONNX for serving with ONNX Runtime
+"""
+import os
+import sys
+
+import torch
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.model_loader import ModelLoader  # noqa: E402
+
+OPSET_VERSION = 17
+
+
+def export_onnx(model_path: str, output_path: str):
+    """Export the checkpoint at model_path to an ONNX file"""
+    loader = ModelLoader(model_path)
+    model = loader.build_model(torch.device("cpu"))
+
+    dummy_input = torch.randn(1, 3, 224, 224)
+    torch.onnx.export(
+        model,
+        dummy_input,
+        output_path,
+        opset_version=OPSET_VERSION,
+        input_names=["input"],
+        output_names=["output"],
+        dynamic_axes={"input": {0: "batch"}, "output": {0: "batch"}},
+    )
+
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"✅ Exported ONNX model to {output_path} ({size_mb:.2f} MB)")
+
+
+def main():
+    """Export the model configured by MODEL_PATH"""
+    model_path = os.getenv("MODEL_PATH", "models/best_model.pth")
+    output_path = os.getenv("ONNX_PATH", "models/best_model.onnx")
+
+    print("=" * 60)
+    print("📦 ONNX Export")
+    print("=" * 60)
+
+    try:
+        export_onnx(model_path, output_path)
+    except Exception as e:
+        print(f"❌ Export failed: {str(e)}")
+        sys.exit(1)
+
+    print(f"\nServe it with: MODEL_PATH={output_path}")
+
+
+if __name__ == "__main__":
+    main()
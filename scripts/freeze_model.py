@@ -0,0 +1,59 @@
+"""
+Model Freezing Script
+Saves a frozen TorchScript model (BatchNorm folded, dropout removed)
+"""
+import os
+import sys
+
+import torch
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.model_loader import ModelLoader, freeze_model  # noqa: E402
+
+
+def export_frozen(model_path: str, output_path: str, optimize_for_inference: bool):
+    """Freeze the checkpoint at model_path and save it as TorchScript"""
+    loader = ModelLoader(model_path)
+    model = loader.build_model(torch.device("cpu"))
+
+    frozen = freeze_model(model, optimize_for_inference)
+
+    # Freezing can introduce small numeric drift, so check the predictions
+    dummy_input = torch.rand(8, 3, 224, 224)
+    with torch.inference_mode():
+        expected = model(dummy_input).argmax(dim=1)
+        actual = frozen(dummy_input).argmax(dim=1)
+    if not torch.equal(expected, actual):
+        raise RuntimeError("Frozen model predictions differ from the eager model")
+
+    frozen.save(output_path)
+
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"✅ Saved frozen model to {output_path} ({size_mb:.2f} MB)")
+
+
+def main():
+    """Freeze the model configured by MODEL_PATH"""
+    model_path = os.getenv("MODEL_PATH", "models/best_model.pth")
+    output_path = os.getenv("FROZEN_PATH", "models/best_model.frozen.pt")
+    optimize_for_inference = (
+        os.getenv("MODEL_OPTIMIZE_FOR_INFERENCE", "false").lower() == "true"
+    )
+
+    print("=" * 60)
+    print("🧊 TorchScript Freezing")
+    print("=" * 60)
+
+    try:
+        export_frozen(model_path, output_path, optimize_for_inference)
+    except Exception as e:
+        print(f"❌ Freezing failed: {str(e)}")
+        sys.exit(1)
+
+    print(f"\nServe it with: MODEL_PATH={output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Model Quantization Script
+Builds a static int8 (post-training quantized) model for CPU inference
+"""
+import os
+import sys
+from pathlib import Path
+
+import torch
+from PIL import Image
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+# Add project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.model_loader import ModelLoader  # noqa: E402
+
+NUM_CALIBRATION_IMAGES = 200
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+FP32_MODULES = ["1.channel_attention", "1.spatial_attention"]
+
+
+def load_calibration_batches(loader: ModelLoader, calibration_dir: str, batch_size=16):
+    """Yield batches of representative images for calibration"""
+    paths = sorted(
+        p
+        for p in Path(calibration_dir).rglob("*")
+        if p.suffix.lower() in IMAGE_EXTENSIONS
+    )[:NUM_CALIBRATION_IMAGES]
+
+    if not paths:
+        raise FileNotFoundError(f"No calibration images found in {calibration_dir}")
+
+    print(f"📊 Calibrating with {len(paths)} images from {calibration_dir}")
+
+    for i in range(0, len(paths), batch_size):
+        tensors = [
+            loader.preprocess(Image.open(p).convert("RGB"))
+            for p in paths[i : i + batch_size]
+        ]
+        yield torch.stack(tensors)
+
+
+def quantize_model(
+    model_path: str,
+    calibration_dir: str,
+    output_path: str,
+    keep_attention_fp32: bool = True,
+):
+    """Quantize the checkpoint at model_path and save it as TorchScript"""
+    torch.backends.quantized.engine = "fbgemm"
+
+    loader = ModelLoader(model_path)
+    model = loader.build_model(torch.device("cpu"))
+
+    # FX graph mode inserts quant/dequant stubs automatically, which eager
+    # mode would require adding to the model by hand
+    qconfig_mapping = get_default_qconfig_mapping("fbgemm")
+    if keep_attention_fp32:
+        # The small attention convs are the most sensitive to int8 error;
+        # the model is wrapped as Sequential(normalize, model), hence "1."
+        for name in FP32_MODULES:
+            qconfig_mapping.set_module_name(name, None)
+    example_inputs = (torch.randn(1, 3, 224, 224),)
+    prepared = prepare_fx(model, qconfig_mapping, example_inputs)
+
+    with torch.inference_mode():
+        for batch in load_calibration_batches(loader, calibration_dir):
+            prepared(batch)
+
+    quantized = convert_fx(prepared)
+    torch.jit.save(torch.jit.script(quantized), output_path)
+
+    size_mb = os.path.getsize(output_path) / (1024 * 1024)
+    print(f"✅ Saved int8 model to {output_path} ({size_mb:.2f} MB)")
+
+
+def main():
+    """Quantize the model configured by MODEL_PATH"""
+    model_path = os.getenv("MODEL_PATH", "models/best_model.pth")
+    calibration_dir = os.getenv("CALIBRATION_DIR", "data/processed")
+    output_path = os.getenv("QUANTIZED_PATH", "models/best_model_int8.pt")
+    keep_attention_fp32 = os.getenv("QUANTIZE_ATTENTION", "false").lower() != "true"
+
+    print("=" * 60)
+    print("🔢 Int8 Post-Training Quantization")
+    print("=" * 60)
+
+    try:
+        quantize_model(model_path, calibration_dir, output_path, keep_attention_fp32)
+    except Exception as e:
+        print(f"❌ Quantization failed: {str(e)}")
+        sys.exit(1)
+
+    print(f"\nServe it on CPU with: MODEL_PATH={output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,12 @@
 CNN model with 2D+1D arcihtecture, transfer learning and attention mechanisms
 """
 
+import contextlib
+from functools import partial
+
 import torch
 import torch.nn as nn
+from torch.utils.checkpoint import checkpoint
 from torchvision import models 
 from torchvision.models import ResNet18_Weights
 
@@ -16,9 +20,10 @@ class SpatialAttention(nn.Module):
         self.sigmoid = nn.Sigmoid()
 
     def forward(self, x):
-        avg_out = torch.mean(x, dim=1, keepdim =True)
-        max_out, _ =torch.max(x, dim=1, keepdim=True)
-        x_cat = torch.cat([avg_out,max_out],dim=1)
+        # amax skips the argmax indices torch.max would also compute
+        avg_out = torch.mean(x, dim=1)
+        max_out = torch.amax(x, dim=1)
+        x_cat = torch.stack([avg_out,max_out],dim=1)
         x_cat = self.conv1(x_cat)
         return self.sigmoid(x_cat)
 
@@ -41,6 +46,58 @@ class ChannelAttention(nn.Module):
         out = avg_out + max_out
         return self.sigmoid(out)
 
+# ImageNet ResNet18 weights, loaded once per process on first use
+_RESNET18_STATE_DICT = None
+
+def _get_resnet18_backbone(pretrained):
+    """Build the ResNet18 feature extractor, reusing already loaded ImageNet weights"""
+    global _RESNET18_STATE_DICT
+    resnet = models.resnet18(weights=None)
+    if pretrained:
+        if _RESNET18_STATE_DICT is None:
+            _RESNET18_STATE_DICT = ResNet18_Weights.IMAGENET1K_V1.get_state_dict(progress=True, check_hash=True)
+        resnet.load_state_dict(_RESNET18_STATE_DICT)
+    return nn.Sequential(*list(resnet.children())[:-2])
+
+@contextlib.contextmanager
+def _frozen_running_stats(modules):
+    """Keep BatchNorm running stats unchanged while checkpointed layers are recomputed"""
+    batchnorms = [
+        m for module in modules for m in module.modules()
+        if isinstance(m, nn.modules.batchnorm._BatchNorm) and m.track_running_stats
+    ]
+    # Without tracking, training-mode BN still normalizes with batch statistics
+    # but neither updates the running stats nor counts the batch
+    for bn in batchnorms:
+        bn.track_running_stats = False
+    try:
+        yield
+    finally:
+        for bn in batchnorms:
+            bn.track_running_stats = True
+
+def _run_segment(segment, x):
+    """Apply a list of layers in order"""
+    for module in segment:
+        x = module(x)
+    return x
+
+def _checkpoint_segment(segment, x):
+    """Run a list of layers, recomputing their activations during backward"""
+    return checkpoint(
+        partial(_run_segment, segment), x, use_reentrant=False,
+        context_fn=lambda: (contextlib.nullcontext(), _frozen_running_stats(segment))
+    )
+
+def _migrate_conv1d_block(state_dict, prefix, *args):
+    """Load checkpoints saved with the Conv1d-based block into linear_block"""
+    old_prefix = prefix + 'conv1d_block.'
+    for key in [k for k in state_dict if k.startswith(old_prefix)]:
+        value = state_dict.pop(key)
+        if value.dim() == 3:
+            value = value[:, :, 0] # Conv1d weight [out,in,1] -> Linear [out,in]
+        state_dict[prefix + 'linear_block.' + key[len(old_prefix):]] = value
+
 class Enhanced_CNN2D1D(nn.Module):
     """
     2D + 1D CNN with transfer learning and attention mechanisms
@@ -57,11 +114,7 @@ class Enhanced_CNN2D1D(nn.Module):
         super(Enhanced_CNN2D1D,self).__init__()
 
         #Pre-trained backbone 
-        if pretrained:
-            self.backbone = models.resnet18(weights=ResNet18_Weights.IMAGENET1K_V1)
-        else:
-            self.backbone = models.resnet18(weights=None)
-        self.backbone = nn.Sequential(*list(self.backbone.children())[:-2])
+        self.backbone = _get_resnet18_backbone(pretrained)
 
         # Additional 2D CNN layers for domain adaptation
         self.conv2d_enhance = nn.Sequential(
@@ -84,23 +137,25 @@ class Enhanced_CNN2D1D(nn.Module):
         # Global Average Pooling
         self.global_avg_pool = nn.AdaptiveAvgPool2d((1,1))
 
-        # 1D CNN for sequential processing of features
-        self.conv1d_block = nn.Sequential(
-            nn.Conv1d(128, 256, kernel_size=1),
+        # 1D "CNN" on the pooled features: kernel-size-1 convs over a length-1
+        # sequence are exactly Linear layers, so they are implemented as such
+        self.linear_block = nn.Sequential(
+            nn.Linear(128, 256),
             nn.BatchNorm1d(256),
             nn.ReLU(inplace=True),
             nn.Dropout(0.5),
 
-            nn.Conv1d(256,512,kernel_size=1),
+            nn.Linear(256,512),
             nn.BatchNorm1d(512),
             nn.ReLU(inplace=True),
             nn.Dropout(0.5),
 
-            nn.Conv1d(512,256,kernel_size=1),
+            nn.Linear(512,256),
             nn.BatchNorm1d(256),
             nn.ReLU(inplace=True),
             nn.Dropout(0.4)
         )
+        self._register_load_state_dict_pre_hook(_migrate_conv1d_block)
 
         # Classification head with skip connections
         self.classifier = nn.Sequential(
@@ -122,48 +177,96 @@ class Enhanced_CNN2D1D(nn.Module):
             nn.Linear(128, num_classes)
         )
 
+        # Recompute backbone activations in backward instead of storing them
+        self.use_checkpointing = False
+
         self._initialize_weights()
 
     def _initialize_weights(self):
         """Initialize weights for new layers"""
+        # Build the membership sets once instead of rescanning per module
+        backbone_ids = {id(m) for m in self.backbone.modules()}
+        linear_block_ids = {id(m) for m in self.linear_block.modules()}
+
         for m in self.modules():
             if isinstance(m, nn.Conv2d) or isinstance(m, nn.Conv1d):
-                if m  not in self.backbone.modules():
+                if id(m) not in backbone_ids:
                     nn.init.kaiming_normal_(m.weight, mode='fan_out', nonlinearity='relu')
             elif isinstance(m, (nn.BatchNorm2d, nn.BatchNorm1d)):
-                if m not in self.backbone.modules():
+                if id(m) not in backbone_ids:
                     nn.init.constant_(m.weight,1)
                     nn.init.constant_(m.bias,0)
             elif isinstance(m, nn.Linear):
-                nn.init.normal_(m.weight, 0, 0.01)
+                if id(m) in linear_block_ids:
+                    # Same init the equivalent Conv1d layers used to get
+                    nn.init.kaiming_normal_(m.weight, mode='fan_out', nonlinearity='relu')
+                else:
+                    nn.init.normal_(m.weight, 0, 0.01)
                 nn.init.constant_(m.bias, 0)
 
-    def forward(self,x):
-        #Extract features using pre-trained backbone
-        x = self.backbone(x) # [batch_size,512,H,W]
+    def enable_checkpointing(self, on: bool = True):
+        """
+        Toggle gradient checkpointing of the backbone and conv2d_enhance during training
+
+        The recomputation in backward leaves BatchNorm running stats alone, so
+        they are updated once per step exactly as without checkpointing.
+        """
+        self.use_checkpointing = on
+        return self
+
+    @torch.jit.unused
+    def _checkpointed_features(self, x):
+        """Backbone + conv2d_enhance, keeping only segment boundary activations"""
+        backbone = list(self.backbone)
+        enhance = list(self.conv2d_enhance)
+
+        # No segment starts with an in-place ReLU, which would overwrite the
+        # segment input saved for recomputation
+        segments = [backbone[:4], backbone[4:6], backbone[6:7], backbone[7:],
+                    enhance[:4], enhance[4:]]
+        for segment in segments:
+            x = _checkpoint_segment(segment, x)
+        return x
 
-        #Enhance features with domain-specific layers
-        x = self.conv2d_enhance(x) # [batch_size,128,H,W]
+    def strip_for_inference(self):
+        """Replace dropout layers with nn.Identity for serving (not reversible)"""
+        for module in self.modules():
+            for name, child in module.named_children():
+                if isinstance(child, nn.modules.dropout._DropoutNd):
+                    setattr(module, name, nn.Identity())
+        return self
 
-        # Apply attention mechanisms
+    def _attend(self, x):
+        """Apply channel then spatial attention, in place when no gradients are needed"""
         channel_att = self.channel_attention(x)
-        x = x * channel_att
+        if torch.is_grad_enabled():
+            x = x * channel_att
+            return x * self.spatial_attention(x)
 
-        spatial_att = self.spatial_attention(x)
-        x = x * spatial_att
+        # At inference the attended map is written back into x instead of
+        # allocating a new [B,128,H,W] tensor for each multiply
+        x.mul_(channel_att)
+        return x.mul_(self.spatial_attention(x))
 
-        # Create skip conncection
-        skip_features = self.global_avg_pool(x).view(x.size(0), -1) # [batch_size,128]
+    def forward(self,x):
+        if self.training and self.use_checkpointing:
+            x = self._checkpointed_features(x)
+        else:
+            #Extract features using pre-trained backbone
+            x = self.backbone(x) # [batch_size,512,H,W]
+
+            #Enhance features with domain-specific layers
+            x = self.conv2d_enhance(x) # [batch_size,128,H,W]
 
-        # Prepare for 1D CNN
-        x = self.global_avg_pool(x) # [batch_size,128,1,1]
-        x = x.view(x.size(0), x.size(1), 1) #[batch_size,128,1]
+        # Apply attention mechanisms
+        x = self._attend(x)
 
-        # 1D CNN processing
-        x = self.conv1d_block(x) #[batch_size,256,1]
+        # Pool once; the pooled features feed both the skip connection and
+        # the sequential block
+        skip_features = self.global_avg_pool(x).flatten(1) # [batch_size,128]
 
-        # Flatten for classification
-        x = x.view(x.size(0), -1) # [batch_Size,256]
+        # Sequential processing of pooled features
+        x = self.linear_block(skip_features) # [batch_size,256]
 
         # Combine with skip connection
         x = torch.cat([x, skip_features],dim=1) #[batch_size,384]
@@ -173,6 +276,7 @@ class Enhanced_CNN2D1D(nn.Module):
 
         return x
 
+    @torch.compiler.disable
     def get_features_maps(self, x, layer_name='attention'):
         """Extract features maps for visualization"""
 
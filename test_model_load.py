@@ -10,6 +10,9 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from models.cnn import Enhanced_CNN2D1D
 
+# Pass --compile to also check the model under torch.compile
+COMPILE = "--compile" in sys.argv
+
 print("=" * 60)
 print("Testing Model Loading")
 print("=" * 60)
@@ -59,8 +62,13 @@ if 'best_val_acc' in checkpoint:
 print("\n5. Testing forward pass...")
 try:
     model.eval()
+    model.strip_for_inference()
+    if COMPILE:
+        torch._dynamo.config.cache_size_limit = 16
+        model = torch.compile(model, mode="reduce-overhead", fullgraph=True, backend="inductor")
+        print("Model compiled with torch.compile (first pass includes compile time)")
     dummy_input = torch.randn(1, 3, 224, 224)
-    with torch.no_grad():
+    with torch.inference_mode():
         output = model(dummy_input)
     print(f"Forward pass successful")
     print(f"   Input shape: {dummy_input.shape}")
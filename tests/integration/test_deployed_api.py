@@ -4,6 +4,7 @@ Tests the API in a real deployment environment
 """
 import io
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import requests
@@ -20,6 +21,9 @@ class TestDeployedAPI:
     @classmethod
     def setup_class(cls):
         """Wait for API to be ready"""
+        # Encode the test image once so requests don't time JPEG encoding
+        cls.test_image_bytes = cls.encode_test_image()
+
         max_retries = 10
         for i in range(max_retries):
             try:
@@ -34,13 +38,17 @@ class TestDeployedAPI:
                 else:
                     raise Exception("API did not become ready in time")
 
-    def create_test_image(self):
-        """Create a test image"""
+    @staticmethod
+    def encode_test_image():
+        """Create a test image as JPEG bytes"""
         img = Image.new("RGB", (224, 224), color="gray")
         img_bytes = io.BytesIO()
         img.save(img_bytes, format="JPEG")
-        img_bytes.seek(0)
-        return img_bytes
+        return img_bytes.getvalue()
+
+    def create_test_image(self):
+        """Create a test image file object from the pre-encoded bytes"""
+        return io.BytesIO(self.test_image_bytes)
 
     def test_health_endpoint(self):
         """Test health check endpoint"""
@@ -112,27 +120,30 @@ class TestDeployedAPI:
         assert response.status_code == 400
 
     def test_performance_benchmark(self):
-        """Benchmark prediction performance"""
+        """Benchmark prediction performance under concurrent requests"""
         num_requests = 10
-        times = []
-
-        for _ in range(num_requests):
-            img_bytes = self.create_test_image()
-            files = {"file": ("test.jpg", img_bytes, "image/jpeg")}
 
-            start = time.time()
+        def timed_predict(_):
+            files = {"file": ("test.jpg", self.test_image_bytes, "image/jpeg")}
+            start = time.perf_counter()
             response = requests.post(
                 f"{API_BASE_URL}/predict", files=files, timeout=TIMEOUT
             )
-            end = time.time()
+            return response.status_code, time.perf_counter() - start
+
+        # Concurrent requests let the server coalesce them into batches
+        with ThreadPoolExecutor(max_workers=num_requests) as executor:
+            start = time.perf_counter()
+            results = list(executor.map(timed_predict, range(num_requests)))
+            total_time = time.perf_counter() - start
 
-            if response.status_code == 200:
-                times.append(end - start)
+        times = [elapsed for status, elapsed in results if status == 200]
 
         if times:
             avg_time = sum(times) / len(times)
             print(f"\nAverage prediction time: {avg_time:.3f}s")
             print(f"Min: {min(times):.3f}s, Max: {max(times):.3f}s")
+            print(f"Throughput: {len(times) / total_time:.1f} requests/s")
 
             # Assert reasonable performance (adjust threshold as needed)
             assert avg_time < 5.0, "Average prediction time too high"
@@ -75,6 +75,13 @@ class TestPredictionEndpoints:
         response = client.post("/predict", files=files)
         assert response.status_code == 400
 
+    def test_predict_endpoint_oversize_file(self):
+        """Test prediction rejects uploads over the size limit"""
+        payload = b"\xff\xd8\xff" + b"\x00" * (11 * 1024 * 1024)
+        files = {"file": ("huge.jpg", payload, "image/jpeg")}
+        response = client.post("/predict", files=files)
+        assert response.status_code == 413
+
     def test_batch_predict_endpoint(self, sample_image):
         """Test batch prediction"""
         files = [
@@ -0,0 +1,55 @@
+"""
+Unit tests for the micro-batching queue
+"""
+import asyncio
+
+import pytest
+import torch
+
+from app.batching import MicroBatcher
+
+
+class FakeModelLoader:
+    """Stand-in model loader that records the batch sizes it receives"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, image_tensors):
+        self.batch_sizes.append(len(image_tensors))
+        return [{"class": "glioma", "value": float(t.sum())} for t in image_tensors]
+
+
+@pytest.mark.asyncio
+class TestMicroBatcher:
+    """Test request coalescing"""
+
+    async def test_concurrent_requests_are_batched(self):
+        """Concurrent submissions should share a forward pass"""
+        loader = FakeModelLoader()
+        batcher = MicroBatcher(loader, max_batch_size=4, max_wait_ms=50)
+        batcher.start()
+
+        try:
+            tensors = [torch.full((3, 2, 2), float(i)) for i in range(4)]
+            results = await asyncio.gather(*[batcher.submit(t) for t in tensors])
+        finally:
+            await batcher.stop()
+
+        assert loader.batch_sizes == [4]
+        assert [r["value"] for r in results] == [0.0, 12.0, 24.0, 36.0]
+
+    async def test_errors_propagate_to_callers(self):
+        """A failing forward pass should fail every request in the batch"""
+        loader = FakeModelLoader()
+        loader.predict_batch = lambda tensors: 1 / 0
+        batcher = MicroBatcher(loader, max_batch_size=2, max_wait_ms=10)
+        batcher.start()
+
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await batcher.submit(torch.zeros(3, 2, 2))
+        finally:
+            await batcher.stop()
+
+        assert not batcher.is_running()
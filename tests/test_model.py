@@ -0,0 +1,142 @@
+"""
+Unit tests for the model architecture and load-time model rewrites
+"""
+import copy
+
+import pytest
+import torch
+import torch.nn as nn
+from torchvision import transforms
+
+from app.model_loader import add_input_normalization, fold_bn_for_inference
+from src.models.cnn import Enhanced_CNN2D1D
+
+
+def _randomize_batchnorm(model):
+    """Give every BatchNorm non-trivial affine parameters and running stats"""
+    with torch.no_grad():
+        for module in model.modules():
+            if isinstance(module, nn.modules.batchnorm._BatchNorm):
+                module.weight.uniform_(0.5, 1.5)
+                module.bias.uniform_(-0.5, 0.5)
+                module.running_mean.uniform_(-0.5, 0.5)
+                module.running_var.uniform_(0.5, 1.5)
+
+
+@pytest.fixture
+def model():
+    """Small-input eval model with random weights"""
+    torch.manual_seed(0)
+    model = Enhanced_CNN2D1D(num_classes=4, pretrained=False)
+    _randomize_batchnorm(model)
+    return model.eval()
+
+
+@pytest.fixture
+def images():
+    """Batch of inputs (64x64 keeps the forward pass fast)"""
+    return torch.rand(2, 3, 64, 64, generator=torch.Generator().manual_seed(1))
+
+
+class TestConv1dCheckpointMigration:
+    """Test loading checkpoints saved with the Conv1d-based 1D block"""
+
+    def test_conv1d_state_dict_matches_old_architecture(self, model, images):
+        """A conv1d_block state_dict should reproduce the old forward pass"""
+        torch.manual_seed(2)
+        conv1d_block = nn.Sequential(
+            nn.Conv1d(128, 256, kernel_size=1),
+            nn.BatchNorm1d(256),
+            nn.ReLU(inplace=True),
+            nn.Dropout(0.5),
+            nn.Conv1d(256, 512, kernel_size=1),
+            nn.BatchNorm1d(512),
+            nn.ReLU(inplace=True),
+            nn.Dropout(0.5),
+            nn.Conv1d(512, 256, kernel_size=1),
+            nn.BatchNorm1d(256),
+            nn.ReLU(inplace=True),
+            nn.Dropout(0.4),
+        )
+        _randomize_batchnorm(conv1d_block)
+        conv1d_block.eval()
+
+        state_dict = {
+            key: value
+            for key, value in model.state_dict().items()
+            if not key.startswith("linear_block.")
+        }
+        for key, value in conv1d_block.state_dict().items():
+            state_dict[f"conv1d_block.{key}"] = value
+        model.load_state_dict(state_dict)
+
+        with torch.inference_mode():
+            # Forward pass of the old architecture
+            x = model.conv2d_enhance(model.backbone(images))
+            x = model._attend(x)
+            pooled = model.global_avg_pool(x)
+            skip_features = pooled.view(pooled.size(0), -1)
+            x = conv1d_block(pooled.view(pooled.size(0), pooled.size(1), 1))
+            x = torch.cat([x.view(x.size(0), -1), skip_features], dim=1)
+            expected = model.classifier(x)
+
+            actual = model(images)
+
+        torch.testing.assert_close(actual, expected)
+
+
+class TestBatchNormFolding:
+    """Test folding BatchNorm into the preceding layers"""
+
+    def test_folded_model_matches_unfolded(self, model, images):
+        """Folding should not change the model outputs"""
+        folded = fold_bn_for_inference(copy.deepcopy(model))
+
+        assert not any(
+            isinstance(module, (nn.BatchNorm1d, nn.BatchNorm2d))
+            for module in folded.classifier.modules()
+        )
+        with torch.inference_mode():
+            torch.testing.assert_close(
+                folded(images), model(images), rtol=1e-4, atol=1e-5
+            )
+
+
+class TestInputNormalization:
+    """Test normalization baked into the model"""
+
+    def test_matches_normalize_transform(self, images):
+        """The prepended conv should equal applying Normalize to the input"""
+        torch.manual_seed(3)
+        inner = nn.Conv2d(3, 8, kernel_size=3, padding=1)
+        normalize = transforms.Normalize(
+            mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]
+        )
+
+        with torch.inference_mode():
+            expected = inner(normalize(images))
+            actual = add_input_normalization(inner)(images)
+
+        torch.testing.assert_close(actual, expected)
+
+
+class TestGradientCheckpointing:
+    """Test training with gradient checkpointing"""
+
+    def test_train_step_matches_without_checkpointing(self, model, images):
+        """Checkpointing should change neither the grads nor the BN running stats"""
+        model.train()
+        checkpointed = copy.deepcopy(model).enable_checkpointing()
+
+        for net in (model, checkpointed):
+            torch.manual_seed(4)  # Same dropout masks for both runs
+            net(images).sum().backward()
+
+        for (name, param), (_, param_ckpt) in zip(
+            model.named_parameters(), checkpointed.named_parameters()
+        ):
+            torch.testing.assert_close(param_ckpt.grad, param.grad, msg=name)
+        for (name, buffer), (_, buffer_ckpt) in zip(
+            model.named_buffers(), checkpointed.named_buffers()
+        ):
+            torch.testing.assert_close(buffer_ckpt, buffer, msg=name)
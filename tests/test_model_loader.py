@@ -0,0 +1,133 @@
+"""
+Unit tests for model loading, preprocessing and batched inference
+"""
+import io
+import os
+
+import pytest
+import torch
+from PIL import Image
+from torchvision import transforms
+
+from app.model_loader import ModelLoader
+from src.models.cnn import Enhanced_CNN2D1D
+
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "models",
+    "best_model.pth",
+)
+
+
+def _test_image(mode="RGB", seed=0):
+    """Smooth synthetic scan-like image (smooth content keeps JPEG decoders close)"""
+    gradient = Image.linear_gradient("L").resize((320, 240))
+    if mode == "L":
+        return gradient.rotate(15 * seed)
+    return Image.merge(
+        "RGB",
+        (
+            gradient.rotate(15 * seed),
+            gradient.rotate(90),
+            gradient.transpose(Image.FLIP_LEFT_RIGHT),
+        ),
+    )
+
+
+def _jpeg_bytes(image):
+    """Encode a PIL image as JPEG"""
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def cpu_loader():
+    """Model loader pinned to the CPU with plain eager inference"""
+    loader = ModelLoader(MODEL_PATH)
+    loader.device = torch.device("cpu")
+    loader.compile_mode = "none"
+    loader.use_ipex = False
+    return loader
+
+
+@pytest.mark.gpu
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA")
+class TestToDevice:
+    """Test moving preprocessed images onto the GPU"""
+
+    def test_tensors_already_on_device(self):
+        """GPU-decoded images (device "cuda:0") should be stacked in place"""
+        loader = ModelLoader()
+        tensors = [torch.rand(3, 224, 224, device="cuda:0") for _ in range(2)]
+
+        batch = loader._to_device(tensors)
+
+        assert batch.device.type == "cuda"
+        torch.testing.assert_close(batch, torch.stack(tensors))
+
+    def test_mixed_devices(self):
+        """A mix of host and GPU images should all end up on the GPU"""
+        loader = ModelLoader()
+        tensors = [torch.rand(3, 224, 224), torch.rand(3, 224, 224, device="cuda:0")]
+
+        batch = loader._to_device(tensors)
+
+        assert batch.device.type == "cuda"
+        torch.testing.assert_close(batch.cpu(), torch.stack([t.cpu() for t in tensors]))
+
+
+class TestPreprocessBytes:
+    """Test decoding uploads with torchvision"""
+
+    @pytest.mark.parametrize("mode", ["RGB", "L"])
+    def test_matches_pil_preprocessing(self, cpu_loader, monkeypatch, mode):
+        """torchvision JPEG decoding should match the PIL path"""
+        jpeg_bytes = _jpeg_bytes(_test_image(mode))
+        expected = cpu_loader.preprocess(
+            Image.open(io.BytesIO(jpeg_bytes)).convert("RGB")
+        )
+
+        # Make sure the torchvision path is taken, not the PIL fallback
+        def fail(*args, **kwargs):
+            raise AssertionError("fell back to PIL")
+
+        monkeypatch.setattr("app.model_loader.Image.open", fail)
+        actual = cpu_loader.preprocess_bytes(jpeg_bytes)
+
+        assert actual.shape == (3, 224, 224)
+        torch.testing.assert_close(actual, expected, atol=0.03, rtol=0)
+        assert (actual - expected).abs().mean() < 0.005
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="model checkpoint missing")
+class TestLoadedModel:
+    """Test the optimized inference path against the plain eager model"""
+
+    def test_predict_batch_matches_eager_model(self, cpu_loader):
+        """build_model's rewrites should not change the predictions"""
+        cpu_loader.load_model()
+        tensors = [cpu_loader.preprocess(_test_image(seed=i)) for i in range(4)]
+
+        results = cpu_loader.predict_batch(tensors)
+
+        checkpoint = torch.load(MODEL_PATH, map_location="cpu", weights_only=False)
+        model = Enhanced_CNN2D1D(num_classes=4, pretrained=False)
+        model.load_state_dict(checkpoint.get("model_state_dict", checkpoint))
+        model.eval()
+        normalize = transforms.Normalize(
+            mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]
+        )
+        with torch.inference_mode():
+            expected = model(normalize(torch.stack(tensors))).softmax(dim=1)
+
+        for result, probs in zip(results, expected):
+            actual = torch.tensor(
+                [result["probabilities"][name] for name in cpu_loader.class_names]
+            )
+            torch.testing.assert_close(actual, probs, atol=1e-3, rtol=0)
+
+            top2 = probs.topk(2).values
+            if top2[0] - top2[1] > 0.01:
+                expected_class = cpu_loader.class_names[probs.argmax()]
+                assert result["class"] == expected_class
@@ -0,0 +1,109 @@
+"""
+Unit tests for monitoring and metrics collection
+"""
+import asyncio
+import json
+import random
+import threading
+
+import pytest
+
+from app.monitoring import MetricsCollector, PredictionLogWriter
+
+
+class TestMetricsCollector:
+    """Test running metrics aggregates"""
+
+    def test_empty_metrics(self):
+        """Metrics should default to zero before any prediction"""
+        metrics = MetricsCollector().get_metrics()
+        assert metrics["total_predictions"] == 0
+        assert metrics["average_confidence"] == 0
+        assert metrics["min_processing_time_ms"] == 0
+        assert metrics["max_processing_time_ms"] == 0
+
+    def test_aggregates_match_history_window(self):
+        """Running aggregates should equal a full scan of the history window"""
+        collector = MetricsCollector(max_history=50)
+        rng = random.Random(0)
+
+        for _ in range(500):
+            collector.record_prediction("glioma", rng.random(), rng.uniform(1.0, 100.0))
+
+        metrics = collector.get_metrics()
+        times = list(collector.processing_times)
+        confidences = list(collector.confidence_scores)
+
+        assert metrics["total_predictions"] == 500
+        assert metrics["average_confidence"] == pytest.approx(
+            sum(confidences) / len(confidences)
+        )
+        assert metrics["average_processing_time_ms"] == pytest.approx(
+            sum(times) / len(times)
+        )
+        assert metrics["min_processing_time_ms"] == min(times)
+        assert metrics["max_processing_time_ms"] == max(times)
+
+    def test_extremes_expire_from_window(self):
+        """Min/max should drop values that left the history window"""
+        collector = MetricsCollector(max_history=3)
+        for processing_time in [100.0, 1.0, 50.0, 40.0, 30.0]:
+            collector.record_prediction("glioma", 0.9, processing_time)
+
+        metrics = collector.get_metrics()
+        assert metrics["min_processing_time_ms"] == 30.0
+        assert metrics["max_processing_time_ms"] == 50.0
+
+    def test_concurrent_recording(self):
+        """Predictions recorded from several threads should all be counted"""
+        collector = MetricsCollector()
+
+        def record():
+            for _ in range(100):
+                collector.record_prediction("glioma", 0.5, 10.0)
+            collector.record_error()
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics = collector.get_metrics()
+        assert metrics["total_predictions"] == 400
+        assert metrics["class_distribution"] == {"glioma": 400}
+        assert metrics["total_errors"] == 4
+        assert metrics["average_confidence"] == pytest.approx(0.5)
+
+
+def _read_entries(log_dir):
+    """Read all JSONL entries written to log_dir"""
+    entries = []
+    for log_file in sorted(log_dir.glob("predictions_*.jsonl")):
+        entries.extend(json.loads(line) for line in log_file.read_text().splitlines())
+    return entries
+
+
+class TestPredictionLogWriter:
+    """Test batched prediction logging"""
+
+    def test_writes_directly_when_not_started(self, tmp_path):
+        """Without a running event loop task, entries are written immediately"""
+        writer = PredictionLogWriter(log_dir=str(tmp_path))
+        writer.write({"prediction_id": "pred_1"})
+
+        assert _read_entries(tmp_path) == [{"prediction_id": "pred_1"}]
+
+    @pytest.mark.asyncio
+    async def test_background_writer_flushes_on_stop(self, tmp_path):
+        """Queued entries should all be on disk after stop()"""
+        writer = PredictionLogWriter(log_dir=str(tmp_path), flush_interval=10)
+        writer.start()
+
+        for i in range(5):
+            writer.write({"prediction_id": f"pred_{i}"})
+        await asyncio.sleep(0)
+        await writer.stop()
+
+        ids = [entry["prediction_id"] for entry in _read_entries(tmp_path)]
+        assert ids == [f"pred_{i}" for i in range(5)]